@@ -2,6 +2,7 @@ from unittest.mock import MagicMock
 
 from tunesynctool.drivers import ServiceDriver
 from tunesynctool.features import PlaylistSynchronizer
+from tunesynctool.features import track_matcher
 from tunesynctool.models import Track
 
 
@@ -45,6 +46,34 @@ def test_find_missing_tracks_handles_equivalent_versions() -> None:
     assert missing == []
 
 
+def test_find_missing_tracks_prints_comparisons_in_debug_mode(capsys) -> None:
+    synchronizer = build_synchronizer()
+
+    spotify_track = make_track(
+        title='Back To Me',
+        artist='KSHMR',
+        service_id='spotify-1',
+    )
+    navidrome_variant = make_track(
+        title='Back To Me (feat. Micky Blue)',
+        artist='KSHMR • Crossnaders • Micky Blue',
+        service_id='navidrome-1',
+        service_name='subsonic',
+    )
+
+    synchronizer.find_missing_tracks(
+        source_playlist_tracks=[spotify_track],
+        target_playlist_tracks=[navidrome_variant],
+        debug=True,
+    )
+
+    output = capsys.readouterr().out
+    assert "Core: 'back to me' | Artist: 'kshmr'" in output
+    assert 'Title sim: 1.00, Artist sim: 0.30' in output
+    assert "Artist compared by words: 1.00 (word overlap: {'kshmr'})" in output
+    assert '✓ MATCH FOUND' in output
+
+
 def test_find_tracks_to_remove_detects_target_only_entries() -> None:
     synchronizer = build_synchronizer()
 
@@ -65,3 +94,114 @@ def test_find_tracks_to_remove_detects_target_only_entries() -> None:
     )
 
     assert tracks_to_remove == [extra_track]
+
+
+def test_find_missing_tracks_matches_source_duplicates_against_same_target() -> None:
+    synchronizer = build_synchronizer()
+
+    first_copy = make_track(
+        title='Strobe - Radio Edit',
+        artist='deadmau5',
+        service_id='spotify-1',
+    )
+    second_copy = make_track(
+        title='Strobe',
+        artist='deadmau5',
+        service_id='spotify-2',
+    )
+    missing_track = make_track(
+        title='Ghosts n Stuff',
+        artist='deadmau5',
+        service_id='spotify-3',
+    )
+    target_track = make_track(
+        title='Strobe',
+        artist='Deadmau5',
+        service_id='navidrome-1',
+        service_name='subsonic',
+    )
+
+    missing = synchronizer.find_missing_tracks(
+        source_playlist_tracks=[first_copy, second_copy, missing_track],
+        target_playlist_tracks=[target_track],
+    )
+
+    assert missing == [missing_track]
+
+
+def test_find_missing_tracks_returns_every_missing_duplicate_in_order() -> None:
+    synchronizer = build_synchronizer()
+
+    first_copy = make_track(
+        title='Ghosts n Stuff',
+        artist='deadmau5',
+        service_id='spotify-1',
+    )
+    other_track = make_track(
+        title='Strobe',
+        artist='deadmau5',
+        service_id='spotify-2',
+    )
+    second_copy = make_track(
+        title='Ghosts n Stuff',
+        artist='deadmau5',
+        service_id='spotify-3',
+    )
+    target_track = make_track(
+        title='Strobe',
+        artist='deadmau5',
+        service_id='navidrome-1',
+        service_name='subsonic',
+    )
+
+    missing = synchronizer.find_missing_tracks(
+        source_playlist_tracks=[first_copy, other_track, second_copy],
+        target_playlist_tracks=[target_track],
+    )
+
+    assert [track.service_id for track in missing] == ['spotify-1', 'spotify-3']
+
+
+def test_is_in_same_order_detects_reordered_tracks() -> None:
+    synchronizer = build_synchronizer()
+
+    first_track = make_track(
+        title='Strobe',
+        artist='deadmau5',
+        service_id='spotify-1',
+    )
+    second_track = make_track(
+        title='Ghosts n Stuff',
+        artist='deadmau5',
+        service_id='spotify-2',
+    )
+
+    assert synchronizer.is_in_same_order(
+        source_playlist_tracks=[first_track, second_track],
+        target_playlist_tracks=[first_track, second_track],
+    )
+    assert not synchronizer.is_in_same_order(
+        source_playlist_tracks=[first_track, second_track],
+        target_playlist_tracks=[second_track, first_track],
+    )
+
+
+def test_sync_sends_the_searches_of_a_track_one_after_the_other(monkeypatch) -> None:
+    monkeypatch.setattr(track_matcher, 'ThreadPoolExecutor', MagicMock(side_effect=AssertionError('no threads expected')))
+
+    source_track = make_track(title='Strobe', artist='deadmau5', service_id='spotify-1')
+    target_track = make_track(title='Strobe', artist='deadmau5', service_id='navidrome-1', service_name='subsonic')
+
+    source_driver = MagicMock(spec=ServiceDriver)
+    source_driver.get_playlist_tracks.return_value = [source_track]
+    target_driver = MagicMock(spec=ServiceDriver)
+    target_driver.service_name = 'subsonic'
+    target_driver.supports_direct_isrc_querying = False
+    target_driver.supports_musicbrainz_id_querying = False
+    target_driver.get_playlist_tracks.return_value = []
+    target_driver.search_tracks.return_value = [target_track]
+
+    PlaylistSynchronizer(source_driver=source_driver, target_driver=target_driver).sync('source', 'target')
+
+    target_driver.add_tracks_to_playlist.assert_called_once_with(playlist_id='target', track_ids=['navidrome-1'])
+
@@ -0,0 +1,20 @@
+from tunesynctool.features.possible_matches import find_possible_matches, IDENTIFIER_MATCH_PRIORITY
+from tunesynctool.models import Track
+
+
+def test_find_possible_matches_rules_out_dissimilar_titles_and_artists() -> None:
+    track = Track(title='Back To Me', primary_artist='KSHMR', isrc='USUS11000001')
+    candidates = [
+        Track(title='Back To Me (feat. Micky Blue)', primary_artist='KSHMR • Crossnaders • Micky Blue'),
+        Track(title='Back To Me', primary_artist='Somebody Else'),
+        Track(title='Strobe', primary_artist='KSHMR'),
+        Track(title='Something else', isrc='USUS11000001'),
+    ]
+
+    possible_matches = find_possible_matches([track], candidates)[0]
+
+    assert possible_matches[0] == 100
+    assert possible_matches[1] == 0
+    assert possible_matches[2] == 0
+    assert possible_matches[3] == IDENTIFIER_MATCH_PRIORITY
+    assert [track.matches(candidate) for candidate in candidates] == [True, False, False, True]
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from tunesynctool.drivers import ServiceDriver
+from tunesynctool.features import PlaylistSynchronizer
+from tunesynctool.models import Track
+
+
+@pytest.fixture(autouse=True)
+def disable_track_matching(monkeypatch) -> None:
+    # Only the same-track rule of the playlist comparison decides, not the Track.matches() fallback
+    monkeypatch.setattr(Track, 'matches', lambda self, other, threshold=None: False)
+
+
+def tracks_equivalent(first: Track, second: Track) -> bool:
+    synchronizer = PlaylistSynchronizer(
+        source_driver=MagicMock(spec=ServiceDriver),
+        target_driver=MagicMock(spec=ServiceDriver),
+    )
+    return synchronizer.find_missing_tracks(source_playlist_tracks=[first], target_playlist_tracks=[second]) == []
+
+
+def test_tracks_equivalent_accepts_different_versions() -> None:
+    original = Track(title='White Lies - Original Mix', primary_artist='Max Vangeli', service_id='1')
+    instrumental = Track(title='White Lies - Instrumental Mix', primary_artist='Max Vangeli', service_id='2')
+
+    assert tracks_equivalent(original, instrumental)
+
+
+def test_tracks_equivalent_accepts_additional_artists() -> None:
+    solo = Track(title='Back To Me', primary_artist='KSHMR', service_id='1')
+    collaboration = Track(title='Back To Me (feat. Micky Blue)', primary_artist='KSHMR • Crossnaders • Micky Blue', service_id='2')
+
+    assert tracks_equivalent(solo, collaboration)
+
+
+def test_tracks_equivalent_rejects_different_titles() -> None:
+    first = Track(title='White Lies - Original Mix', primary_artist='Max Vangeli', service_id='1')
+    second = Track(title='Stars (original mix)', primary_artist='Max Vangeli', service_id='2')
+
+    assert not tracks_equivalent(first, second)
+
+
+def test_tracks_equivalent_accepts_reordered_artists() -> None:
+    first = Track(title='Turn Down for What', primary_artist='DJ Snake & Lil Jon', service_id='1')
+    second = Track(title='Turn Down for What', primary_artist='Lil Jon & DJ Snake', service_id='2')
+
+    assert tracks_equivalent(first, second)
+
+
+def test_tracks_equivalent_accepts_missing_artists() -> None:
+    first = Track(title='Turn Down for What', service_id='1')
+    second = Track(title='Turn Down for What', service_id='2')
+
+    assert tracks_equivalent(first, second)
@@ -0,0 +1,171 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from tunesynctool.drivers import ServiceDriver
+from tunesynctool.features import TrackMatcher
+from tunesynctool.features import track_matcher
+from tunesynctool.features.track_matcher import _TrackIndex
+from tunesynctool.models import Track
+
+
+def build_driver(search_results: list) -> MagicMock:
+    driver = MagicMock(spec=ServiceDriver)
+    driver.service_name = 'subsonic'
+    driver.supports_direct_isrc_querying = False
+    driver.supports_musicbrainz_id_querying = False
+    driver.search_tracks.return_value = search_results
+    return driver
+
+
+def test_find_match_reuses_tracks_seen_in_earlier_searches() -> None:
+    target_track = Track(
+        title='Strobe',
+        primary_artist='deadmau5',
+        isrc='CA5KR0900001',
+        service_id='navidrome-1',
+        service_name='subsonic',
+    )
+    driver = build_driver([target_track])
+    matcher = TrackMatcher(driver)
+
+    first_source = Track(title='Strobe', primary_artist='deadmau5', service_id='spotify-1', service_name='spotify')
+    assert matcher.find_match(first_source) is target_track
+
+    # A differently titled copy of the same recording is matched by its ISRC without searching again
+    driver.search_tracks.reset_mock()
+    second_source = Track(
+        title='Strobe (Radio Edit)',
+        primary_artist='deadmau5',
+        isrc='CA5KR0900001',
+        service_id='spotify-2',
+        service_name='spotify',
+    )
+    assert matcher.find_match(second_source) is target_track
+    driver.search_tracks.assert_not_called()
+
+
+def test_find_match_prefers_the_most_similar_result() -> None:
+    other_release = Track(
+        title='Strobe',
+        primary_artist='deadmau5',
+        album_name='Strobe (Remixes)',
+        duration_seconds=400,
+        service_id='navidrome-1',
+        service_name='subsonic',
+    )
+    same_release = Track(
+        title='Strobe',
+        primary_artist='deadmau5',
+        album_name='For Lack of a Better Name',
+        duration_seconds=200,
+        service_id='navidrome-2',
+        service_name='subsonic',
+    )
+    matcher = TrackMatcher(build_driver([other_release, same_release]))
+
+    source = Track(
+        title='Strobe',
+        primary_artist='deadmau5',
+        album_name='For Lack of a Better Name',
+        duration_seconds=200,
+        service_id='spotify-1',
+        service_name='spotify',
+    )
+
+    assert source.matches(other_release)
+    assert matcher.find_match(source) is same_release
+
+
+def test_find_match_reuses_perfect_matches_from_earlier_searches() -> None:
+    details = dict(primary_artist='deadmau5', album_name='For Lack of a Better Name', duration_seconds=200)
+    strobe = Track(title='Strobe', service_id='navidrome-1', service_name='subsonic', **details)
+    ghosts = Track(title='Ghosts n Stuff', service_id='navidrome-2', service_name='subsonic', **details)
+    driver = build_driver([strobe, ghosts])
+    matcher = TrackMatcher(driver)
+
+    assert matcher.find_match(Track(title='Strobe', service_id='spotify-1', service_name='spotify', **details)) is strobe
+
+    # The other track of the same album already came up in the first search
+    driver.search_tracks.reset_mock()
+    assert matcher.find_match(Track(title='Ghosts n Stuff', service_id='spotify-2', service_name='spotify', **details)) is ghosts
+    driver.search_tracks.assert_not_called()
+
+
+def test_find_match_reuses_searches_of_earlier_tracks() -> None:
+    strobe = Track(title='Strobe', primary_artist='deadmau5', service_id='navidrome-1', service_name='subsonic')
+    ghosts = Track(title='Ghosts n Stuff', primary_artist='deadmau5', service_id='navidrome-2', service_name='subsonic')
+    driver = build_driver([strobe, ghosts])
+    matcher = TrackMatcher(driver)
+
+    assert matcher.find_match(Track(title='Strobe', primary_artist='deadmau5', service_id='spotify-1', service_name='spotify')) is strobe
+    assert matcher.find_match(Track(title='Ghosts n Stuff', primary_artist='deadmau5', service_id='spotify-2', service_name='spotify')) is ghosts
+
+    # Both tracks search for their artist, which is only sent to the target service once
+    artist_searches = [call for call in driver.search_tracks.call_args_list if call.kwargs['query'] == 'deadmau5']
+    assert len(artist_searches) == 1
+
+
+def test_find_match_keeps_the_query_order_with_concurrent_searches() -> None:
+    first_result = Track(title='Strobe', primary_artist='deadmau5', service_id='navidrome-1', service_name='subsonic')
+    later_result = Track(title='Strobe', primary_artist='deadmau5', service_id='navidrome-2', service_name='subsonic')
+
+    later_query_started = threading.Event()
+
+    def search_tracks(query: str, limit: int) -> list:
+        # The first query only finishes once a later one has run
+        if query == 'deadmau5 strobe':
+            assert later_query_started.wait(timeout=5)
+            return [first_result]
+        later_query_started.set()
+        return [later_result]
+
+    driver = build_driver([])
+    driver.search_tracks.side_effect = search_tracks
+    matcher = TrackMatcher(driver, search_workers=5)
+
+    # Equally similar results are decided by the order of the queries, not by which one finished first
+    assert matcher.find_match(Track(title='Strobe', primary_artist='deadmau5', service_id='spotify-1', service_name='spotify')) is first_result
+
+
+def test_find_match_searches_without_threads_with_a_single_worker(monkeypatch) -> None:
+    monkeypatch.setattr(track_matcher, 'ThreadPoolExecutor', MagicMock(side_effect=AssertionError('no threads expected')))
+    target_track = Track(title='Strobe', primary_artist='deadmau5', service_id='navidrome-1', service_name='subsonic')
+    matcher = TrackMatcher(build_driver([target_track]), search_workers=1)
+
+    assert matcher.find_match(Track(title='Strobe', primary_artist='deadmau5', service_id='spotify-1', service_name='spotify')) is target_track
+
+
+def test_find_match_falls_back_to_wider_searches() -> None:
+    target_track = Track(title='Strobe', primary_artist='deadmau5', service_id='navidrome-1', service_name='subsonic')
+    driver = build_driver([])
+    # Only the artist search of the fallback asks for enough results to include the track
+    driver.search_tracks.side_effect = lambda query, limit: [target_track] if (query, limit) == ('deadmau5', 50) else []
+    matcher = TrackMatcher(driver, search_workers=1)
+
+    with patch('tunesynctool.features.track_matcher.Musicbrainz.id_from_track', return_value=None):
+        assert matcher.find_match(Track(title='Strobe', primary_artist='deadmau5', service_id='spotify-1', service_name='spotify')) is target_track
+
+    # The core title search is the same in both strategies, so it's only sent once
+    searches = [(call.kwargs['query'], call.kwargs['limit']) for call in driver.search_tracks.call_args_list]
+    assert searches.count(('strobe', 50)) == 1
+    assert ('deadmau5 strobe', 50) in searches
+
+
+def test_track_index_forgets_the_least_recently_used_keys() -> None:
+    index = _TrackIndex(max_tracks=2)
+    strobe = Track(title='Strobe', isrc='CA5KR0900001', service_id='navidrome-1', service_name='subsonic')
+    ghosts = Track(title='Ghosts n Stuff', isrc='CA5KR0800002', service_id='navidrome-2', service_name='subsonic')
+    raise_your_weapon = Track(title='Raise Your Weapon', isrc='CA5KR1000003', service_id='navidrome-3', service_name='subsonic')
+
+    index.add(strobe.isrc, strobe)
+    index.add(ghosts.isrc, ghosts)
+    index.add(strobe.isrc, strobe)
+    assert index.get(strobe.isrc) == [strobe]
+
+    index.add(raise_your_weapon.isrc, raise_your_weapon)
+
+    assert len(index) == 2
+    assert index.get(ghosts.isrc) == []
+    assert index.get(strobe.isrc) == [strobe]
+    assert index.get(raise_your_weapon.isrc) == [raise_your_weapon]
+
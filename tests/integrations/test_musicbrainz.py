@@ -0,0 +1,25 @@
+from unittest.mock import patch
+
+from tunesynctool.integrations import Musicbrainz
+from tunesynctool.models import Track
+
+
+def test_id_from_track_reuses_earlier_lookups() -> None:
+    with patch('tunesynctool.integrations.musicbrainz.musicbrainzngs.search_recordings') as search_recordings:
+        search_recordings.return_value = {'recording-list': [{'id': 'mbid-strobe'}]}
+
+        first = Track(title='Strobe', primary_artist='deadmau5', release_year=2009, service_id='spotify-1')
+        second = Track(title='Strobe', primary_artist='deadmau5', release_year=2009, service_id='navidrome-1')
+
+        assert Musicbrainz.id_from_track(first) == 'mbid-strobe'
+        assert Musicbrainz.id_from_track(second) == 'mbid-strobe'
+        search_recordings.assert_called_once()
+
+
+def test_id_from_isrc_reuses_earlier_lookups() -> None:
+    with patch('tunesynctool.integrations.musicbrainz.musicbrainzngs.search_recordings') as search_recordings:
+        search_recordings.return_value = {'recording-list': []}
+
+        assert Musicbrainz.id_from_isrc('CA5KR0900099') is None
+        assert Musicbrainz.id_from_isrc('CA5KR0900099') is None
+        search_recordings.assert_called_once_with(isrc='CA5KR0900099')
@@ -0,0 +1,20 @@
+import pytest
+from tunesynctool.utilities.comparison import calculate_similarity_matrix, calculate_str_similarity
+
+def test_similarity_matrix_agrees_with_str_similarity():
+    a = ['back to me', 'strobe', 'ghosts n stuff']
+    b = ['back to me remix', 'strobe radio edit', 'strobes', '']
+    scores = calculate_similarity_matrix(a, b, threshold=0.65)
+
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            assert (scores[i, j] > 0) == (calculate_str_similarity(x, y) >= 0.65)
+
+def test_similarity_matrix_rounds_halves_to_even():
+    # The strings score exactly 84.5, which rounds down to 84
+    a = ['a' * 169 + 'b' * 31]
+    b = ['a' * 169 + 'c' * 31]
+
+    assert calculate_str_similarity(a[0], b[0]) == 0.84
+    assert calculate_similarity_matrix(a, b, threshold=0.85)[0, 0] == 0
+    assert calculate_similarity_matrix(a, b, threshold=0.84)[0, 0] > 0
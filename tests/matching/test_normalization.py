@@ -1,5 +1,6 @@
 import pytest
-from tunesynctool.utilities.normalization import clean_str
+from tunesynctool.utilities import normalization
+from tunesynctool.utilities.normalization import clean_str, extract_core_title
 
 def test_clean_str_empty():
     assert clean_str('') == ''
@@ -45,4 +46,20 @@ def test_clean_str_whitespace():
 def test_clean_str_case():
     assert clean_str('Hello World') == 'hello world'
     assert clean_str('HELLO WORLD') == 'hello world'
-    assert clean_str('hello world') == 'hello world'
\ No newline at end of file
+    assert clean_str('hello world') == 'hello world'
+
+@pytest.mark.parametrize('title', [
+    'a' * 260 + ' - Radio Edit',
+    'a' * 260 + ' - caféRemix',
+    'é' * 260 + ' - Radio Edit',
+    'a - ' * 100 + 'Live',
+], ids=['ascii', 'non-ascii-keyword', 'non-ascii', 'many-dashes'])
+def test_extract_core_title_same_with_and_without_re2(monkeypatch, title):
+    pytest.importorskip('re2')
+
+    # Bypasses the cache, so both engines actually run
+    with_re2 = extract_core_title.__wrapped__(title)
+    monkeypatch.setattr(normalization, '_CORE_TITLE_RE2', None)
+    without_re2 = extract_core_title.__wrapped__(title)
+
+    assert with_re2 == without_re2
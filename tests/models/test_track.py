@@ -39,4 +39,21 @@ class TestTrack:
         assert track.musicbrainz_id == None
         assert track.service_id == None
         assert track.service_name == 'unknown'
-        assert track.service_data == {}
\ No newline at end of file
+        assert track.service_data == None
+
+    def test_normalized_values(self):
+        track = Track(title='Back To Me (feat. Micky Blue)', primary_artist='KSHMR', album_name='Back To Me')
+
+        assert track.clean_title == 'back to me micky blue'
+        assert track.clean_core_title == 'back to me'
+        assert track.clean_artist == 'kshmr'
+        assert track.clean_album_name == 'back to me'
+
+    def test_shares_identifier(self):
+        track = Track(title='Strobe', isrc='USUS11000001', musicbrainz_id='mbid-1')
+
+        assert track.shares_identifier(Track(title='Something else', isrc='USUS11000001'))
+        assert track.shares_identifier(Track(title='Something else', musicbrainz_id='mbid-1'))
+        assert not track.shares_identifier(Track(title='Strobe'))
+        assert not Track(title='Strobe').shares_identifier(Track(title='Strobe'))
+        assert not track.shares_identifier(None)
@@ -29,8 +29,12 @@ print("\n" + "=" * 70)
 print("SEARCHING FOR 'BACK TO ME' IN BOTH PLAYLISTS")
 print("=" * 70)
 
-spotify_back_to_me = [t for t in spotify_tracks if 'back to me' in t.title.lower()]
-navidrome_back_to_me = [t for t in navidrome_tracks if 'back to me' in t.title.lower()]
+# Lowercase every title once so more searches can reuse them
+spotify_titles = [(t, t.title.lower()) for t in spotify_tracks]
+navidrome_titles = [(t, t.title.lower()) for t in navidrome_tracks]
+
+spotify_back_to_me = [t for t, title in spotify_titles if 'back to me' in title]
+navidrome_back_to_me = [t for t, title in navidrome_titles if 'back to me' in title]
 
 print(f"\nSpotify 'Back To Me' tracks: {len(spotify_back_to_me)}")
 for t in spotify_back_to_me:
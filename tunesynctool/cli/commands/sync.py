@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List
 
 from tunesynctool.cli.utils.driver import get_driver_by_name, SUPPORTED_PROVIDERS
@@ -6,7 +7,7 @@ from tunesynctool.features import PlaylistSynchronizer, TrackMatcher
 from tunesynctool.models import Track
 from tunesynctool.exceptions import PlaylistNotFoundException, UnsupportedFeatureException
 
-from click import command, option, Choice, echo, argument, pass_obj, UsageError, style, Abort
+from click import command, option, Choice, echo, argument, pass_obj, UsageError, style, Abort, IntRange
 from tqdm import tqdm
 
 COMMON_MATCH_ISSUE_REASON = 'This is likely caused by tracks not being available on the target service, they lack metadata or the matching algorithm was unsuccessful in finding them.'
@@ -25,6 +26,7 @@ def list_tracks(tracks: List[Track], color: str = 'yellow') -> None:
 @option('--diff', 'show_diff', is_flag=True, show_default=True, default=False, help='Show the difference between the source and target playlists.')
 @option('--misses', 'show_misses', is_flag=True, show_default=True, default=False, help='Show the tracks that couldn\'t be matched.')
 @option('--limit', 'limit', type=int, default=0, show_default=True, help='Limit the number of tracks to transfer. 0 or smaller means no limit. Default is 100. There is no upper limit, but be aware that some services may rate limit you.')
+@option('--workers', 'workers', type=IntRange(min=1), default=8, show_default=True, help='Number of tracks to match concurrently. Lower this if the target service rate limits you.')
 def sync(
     ctx: Optional[dict],
     from_provider: str,
@@ -34,7 +36,8 @@ def sync(
     is_preview: bool,
     show_diff: bool,
     show_misses: bool,
-    limit: int
+    limit: int,
+    workers: int
     ):
     """Synchronizes a playlist from one service to another. Updates the target playlist with the source playlist's missing tracks."""
 
@@ -89,31 +92,10 @@ def sync(
     # Check if order needs to be fixed even when track sets match
     order_needs_sync = False
     if len(tracks_to_add) == 0 and len(tracks_to_remove) == 0 and len(source_playlist_tracks) == len(target_playlist_tracks):
-        # Compare order by checking if matched tracks are in same positions
-        for i, source_track in enumerate(source_playlist_tracks):
-            if i >= len(target_playlist_tracks):
-                break
-            target_track = target_playlist_tracks[i]
-            # Use same matching logic as find_missing_tracks
-            if not source_track.matches(target_track):
-                from tunesynctool.utilities import clean_str, extract_core_title, calculate_str_similarity
-                source_core = clean_str(extract_core_title(source_track.title))
-                target_core = clean_str(extract_core_title(target_track.title))
-                source_artist = clean_str(source_track.primary_artist)
-                target_artist = clean_str(target_track.primary_artist)
-                
-                title_sim = calculate_str_similarity(source_core, target_core)
-                artist_sim = calculate_str_similarity(source_artist, target_artist)
-                
-                if artist_sim < 0.5:
-                    source_words = set(source_artist.split())
-                    target_words = set(target_artist.split())
-                    if source_words & target_words:
-                        artist_sim = 0.7
-                
-                if not (title_sim >= 0.85 and artist_sim >= 0.5):
-                    order_needs_sync = True
-                    break
+        order_needs_sync = not synchronizer.is_in_same_order(
+            source_playlist_tracks=source_playlist_tracks,
+            target_playlist_tracks=target_playlist_tracks
+        )
 
     if len(tracks_to_add) == 0 and len(tracks_to_remove) == 0 and not order_needs_sync:
         echo(style('No tracks to sync, target playlist is up-to-date', fg='green'))
@@ -130,21 +112,36 @@ def sync(
         echo(style('Tracks to remove:', fg='magenta'))
         list_tracks(tracks_to_remove, color='magenta')
     
-    matcher = TrackMatcher(target_driver)
+    # Tracks are already matched concurrently, so each one sends its search queries one by one
+    # to keep the number of simultaneous requests at --workers
+    matcher = TrackMatcher(target_driver, search_workers=1)
 
     matched_tracks: List[Track] = []
     unmatched_tracks: List[Track] = []
 
     if len(tracks_to_add) > 0:
-        for track in tqdm(tracks_to_add, desc='Matching tracks'):
-            matched_track = matcher.find_match(track)
-
+        # Matching is mostly waiting on the target service, so tracks are matched concurrently
+        match_results: List[Optional[Track]] = [None] * len(tracks_to_add)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(matcher.find_match, track): i for i, track in enumerate(tracks_to_add)}
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc='Matching tracks'):
+                i = futures[future]
+                track = tracks_to_add[i]
+                matched_track = future.result()
+                match_results[i] = matched_track
+
+                if matched_track:
+                    tqdm.write(style(f"Success: Found match: \"{track}\" --> \"{matched_track}\"", fg='green'))
+                else:
+                    tqdm.write(style(f"Fail: No result for \"{track}\"", fg='yellow'))
+
+        # Keep the source playlist's order regardless of which lookup finished first
+        for track, matched_track in zip(tracks_to_add, match_results):
             if matched_track:
                 matched_tracks.append(matched_track)
-                tqdm.write(style(f"Success: Found match: \"{track}\" --> \"{matched_track}\"", fg='green'))
             else:
                 unmatched_tracks.append(track)
-                tqdm.write(style(f"Fail: No result for \"{track}\"", fg='yellow'))
 
         echo(style(f"Found {len(matched_tracks)} matches in total", fg='blue' if len(matched_tracks) > 0 else 'red'))
 
@@ -1,11 +1,24 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+import numpy as np
 
 from tunesynctool.drivers import ServiceDriver
 from tunesynctool.models import Track
+from tunesynctool.features.possible_matches import find_possible_matches
+from tunesynctool.utilities import calculate_similarity_matrix
 from tunesynctool.features.track_matcher import TrackMatcher
-from tunesynctool.utilities import clean_str, extract_core_title, calculate_str_similarity
 from tunesynctool.exceptions import UnsupportedFeatureException
 
+CORE_TITLE_SIMILARITY_THRESHOLD = 0.85
+"""Minimum similarity of the core titles for two tracks to be considered the same track, possibly a different version."""
+
+ARTIST_SIMILARITY_THRESHOLD = 0.5
+"""Minimum (token set) similarity of the artists for two tracks to be considered the same track."""
+
+SIMILARITY_BLOCK_ROWS = 512
+"""Number of source tracks whose similarities to every target track are computed at once (bounds the memory of large comparisons)."""
+
 class PlaylistSynchronizer:
     """
     Attempts to synchronize a playlist between two services.
@@ -22,6 +35,7 @@ class PlaylistSynchronizer:
         self.__source = source_driver
         self.__target = target_driver
         self.__target_matcher = TrackMatcher(target_driver)
+        self.__last_match: Optional[Tuple[Tuple[Track, ...], Tuple[Track, ...], np.ndarray]] = None
     
     def find_missing_tracks(self, source_playlist_tracks: List[Track], target_playlist_tracks: List[Track], debug: bool = False) -> List[Track]:
         """
@@ -39,79 +53,53 @@ class PlaylistSynchronizer:
         :return: A list of tracks that are present in the source playlist but not in the target playlist.
         """
 
-        tracks_that_are_not_in_target_but_are_in_source = []
         # Don't use processed_target_tracks - allow same target track to match multiple source duplicates
+        match_matrix = self.__get_match_matrix(source_playlist_tracks, target_playlist_tracks)
+        self.__resolve_unmatched(match_matrix, source_playlist_tracks, target_playlist_tracks)
+
+        has_match, first_match = self.__find_first_matches(match_matrix)
 
-        for source_track in source_playlist_tracks:
-            match_found = False
-
-            # Get core title and artist for source track
-            source_core_title = clean_str(extract_core_title(source_track.title))
-            source_artist = clean_str(source_track.primary_artist)
-            
-            if debug:
-                print(f"\n[DEBUG] Checking source: {source_track.primary_artist} - {source_track.title}")
-                print(f"        Core: '{source_core_title}' | Artist: '{source_artist}'")
-
-            for target_track in target_playlist_tracks:
-                # Removed the processed_target_tracks check to allow source duplicates
-                # to match the same target track
-
-                # First try exact matching (faster)
-                if source_track.matches(target_track):
-                    match_found = True
-                    break
-                
-                # Then try core title matching (for different versions of same track)
-                target_core_title = clean_str(extract_core_title(target_track.title))
-                target_artist = clean_str(target_track.primary_artist)
-                
-                if debug:
-                    print(f"        vs: {target_track.primary_artist} - {target_track.title}")
-                    print(f"            Core: '{target_core_title}' | Artist: '{target_artist}'")
-                
-                # If core titles and artists are very similar, consider it the same track
-                title_similarity = calculate_str_similarity(source_core_title, target_core_title)
-                artist_similarity = calculate_str_similarity(source_artist, target_artist)
-                
-                if debug:
-                    print(f"            Title sim: {title_similarity:.2f}, Artist sim: {artist_similarity:.2f}")
-                
-                # Check for artist word overlap if similarity is low
-                if artist_similarity < 0.5:
-                    source_artist_words = set(source_artist.split())
-                    target_artist_words = set(target_artist.split())
-                    if source_artist_words & target_artist_words:
-                        artist_similarity = 0.7
-                        if debug:
-                            print(f"            Artist boosted to 0.70 (word overlap: {source_artist_words & target_artist_words})")
-                
-                # If both core title and artist match well, it's the same track (different version)
-                if title_similarity >= 0.85 and artist_similarity >= 0.5:
-                    match_found = True
-                    if debug:
-                        print(f"            ✓ MATCH FOUND")
-                    break
-
-            if not match_found:
-                tracks_that_are_not_in_target_but_are_in_source.append(source_track)
-                if debug:
-                    print(f"        ✗ NO MATCH - marked as missing")
-
-        return tracks_that_are_not_in_target_but_are_in_source
+        if debug:
+            self.__print_comparisons(source_playlist_tracks, target_playlist_tracks, has_match, first_match)
+
+        return [source_track for source_track, matched in zip(source_playlist_tracks, has_match) if not matched]
     
     def find_tracks_to_remove(self, source_playlist_tracks: List[Track], target_playlist_tracks: List[Track]) -> List[Track]:
         """
         Returns tracks that exist on the target playlist but not on the source playlist.
 
-        This reuses the same comparison logic as find_missing_tracks by swapping the reference lists.
+        Uses the same comparison as find_missing_tracks(), whose results it reuses (see __get_match_matrix()).
         """
 
-        return self.find_missing_tracks(
-            source_playlist_tracks=target_playlist_tracks,
-            target_playlist_tracks=source_playlist_tracks
-        )
+        match_matrix = self.__get_match_matrix(source_playlist_tracks, target_playlist_tracks)
+        self.__resolve_unmatched(match_matrix.T, target_playlist_tracks, source_playlist_tracks)
+
+        has_match = match_matrix.any(axis=0)
+
+        return [target_track for target_track, matched in zip(target_playlist_tracks, has_match) if not matched]
     
+    def is_in_same_order(self, source_playlist_tracks: List[Track], target_playlist_tracks: List[Track]) -> bool:
+        """
+        Returns whether both playlists contain the same tracks in the same order.
+
+        Uses the same comparison as find_missing_tracks(), whose results it reuses (see __get_match_matrix()).
+        """
+
+        if len(source_playlist_tracks) != len(target_playlist_tracks):
+            return False
+
+        # Playlists listing the very same service tracks (e.g., when syncing between two playlists
+        # on the same service) are in order without having to compare anything
+        if source_playlist_tracks == target_playlist_tracks:
+            return True
+
+        match_matrix = self.__get_match_matrix(source_playlist_tracks, target_playlist_tracks)
+
+        return all(
+            match_matrix[i, i] or source_track.matches(target_track)
+            for i, (source_track, target_track) in enumerate(zip(source_playlist_tracks, target_playlist_tracks))
+        )
+
     def sync(self, source_playlist_id: str, target_playlist_id: str) -> None:
         """
         Synchronizes the source playlist with the target playlist.
@@ -131,39 +119,16 @@ class PlaylistSynchronizer:
             playlist_id=target_playlist_id
         )
 
+        match_matrix = self.__get_match_matrix(source_playlist_tracks, target_playlist_tracks)
+        self.__resolve_unmatched(match_matrix, source_playlist_tracks, target_playlist_tracks)
+
         # Build the desired target playlist by matching each source track
         desired_target_order = []
-        for source_track in source_playlist_tracks:
-            # First, try to find the track in the existing target playlist
-            matched_in_target = None
-            for target_track in target_playlist_tracks:
-                # Get core title and artist for comparison
-                source_core_title = clean_str(extract_core_title(source_track.title))
-                source_artist = clean_str(source_track.primary_artist)
-                target_core_title = clean_str(extract_core_title(target_track.title))
-                target_artist = clean_str(target_track.primary_artist)
-                
-                # Check if they match (same logic as find_missing_tracks)
-                if source_track.matches(target_track):
-                    matched_in_target = target_track
-                    break
-                
-                title_similarity = calculate_str_similarity(source_core_title, target_core_title)
-                artist_similarity = calculate_str_similarity(source_artist, target_artist)
-                
-                if artist_similarity < 0.5:
-                    source_artist_words = set(source_artist.split())
-                    target_artist_words = set(target_artist.split())
-                    if source_artist_words & target_artist_words:
-                        artist_similarity = 0.7
-                
-                if title_similarity >= 0.85 and artist_similarity >= 0.5:
-                    matched_in_target = target_track
-                    break
-            
+        has_match, first_match = self.__find_first_matches(match_matrix)
+        for source_track, matched, target_index in zip(source_playlist_tracks, has_match, first_match):
             # If found in existing target, use it; otherwise search the target service
-            if matched_in_target:
-                desired_target_order.append(matched_in_target)
+            if matched:
+                desired_target_order.append(target_playlist_tracks[target_index])
             else:
                 # Try to find the track on the target service
                 searched_track = self.__target_matcher.find_match(track=source_track)
@@ -186,4 +151,177 @@ class PlaylistSynchronizer:
             self.__target.add_tracks_to_playlist(
                 playlist_id=target_playlist_id,
                 track_ids=[track.service_id for track in desired_target_order]
-            )
\ No newline at end of file
+            )
+
+    def __compute_equivalence_matrix(self, source_tracks: Tuple[Track, ...], target_tracks: Tuple[Track, ...]) -> np.ndarray:
+        """
+        Returns a boolean matrix where [i, j] tells if the i-th source and the j-th target track
+        have very similar core titles and artists (so they are the same track, possibly a different version).
+
+        Similarities are computed by rapidfuzz in batched calls per field, see SIMILARITY_BLOCK_ROWS.
+        Repeated (core title, artist) pairs are only compared once.
+        """
+
+        source_keys, source_rows = self.__deduplicate([(track.clean_core_title, track.clean_artist) for track in source_tracks])
+        target_keys, target_columns = self.__deduplicate([(track.clean_core_title, track.clean_artist) for track in target_tracks])
+
+        source_titles = [core_title for core_title, _ in source_keys]
+        target_titles = [core_title for core_title, _ in target_keys]
+        source_artists = [artist for _, artist in source_keys]
+        target_artists = [artist for _, artist in target_keys]
+
+        source_without_artist = np.array([not artist for artist in source_artists], dtype=bool)
+        target_without_artist = np.array([not artist for artist in target_artists], dtype=bool)
+
+        # The scores are reduced to booleans one block of rows at a time,
+        # so only a few rows of them are ever held in memory (instead of every pair at once)
+        equivalent = np.zeros((len(source_keys), len(target_keys)), dtype=bool)
+        for start in range(0, len(source_keys), SIMILARITY_BLOCK_ROWS):
+            block = slice(start, start + SIMILARITY_BLOCK_ROWS)
+
+            # Tracks are the same if their core titles and their artists (compared word by word) are very similar
+            titles_match = calculate_similarity_matrix(
+                source_titles[block],
+                target_titles,
+                threshold=CORE_TITLE_SIMILARITY_THRESHOLD,
+                workers=-1
+            ) > 0
+
+            artists_match = calculate_similarity_matrix(
+                source_artists[block],
+                target_artists,
+                threshold=ARTIST_SIMILARITY_THRESHOLD,
+                scorer=fuzz.token_set_ratio,
+                workers=-1
+            ) > 0
+
+            # Tracks without an artist on both sides count as the same artist (token_set_ratio() scores two empty strings 0)
+            artists_match |= np.logical_and.outer(source_without_artist[block], target_without_artist)
+
+            equivalent[block] = titles_match & artists_match
+
+        # Expands the unique pairs back to one row per source and one column per target track
+        return equivalent[np.ix_(source_rows, target_columns)]
+
+    def __print_comparisons(
+        self,
+        source_playlist_tracks: List[Track],
+        target_playlist_tracks: List[Track],
+        has_match: np.ndarray,
+        first_match: np.ndarray
+    ) -> None:
+        """
+        Prints how each source track compares to the target tracks, up to its first match.
+        The similarities are only computed for this, one source track at a time.
+        """
+
+        target_titles = [track.clean_core_title for track in target_playlist_tracks]
+        target_artists = [track.clean_artist for track in target_playlist_tracks]
+
+        for source_track, matched, target_index in zip(source_playlist_tracks, has_match, first_match):
+            print(f"\n[DEBUG] Checking source: {source_track.primary_artist} - {source_track.title}")
+            print(f"        Core: '{source_track.clean_core_title}' | Artist: '{source_track.clean_artist}'")
+
+            compared_targets = target_playlist_tracks[:target_index + 1] if matched else target_playlist_tracks
+            if compared_targets:
+                # Rounded to whole percents like calculate_str_similarity() does
+                title_similarities = np.rint(process.cdist([source_track.clean_core_title], target_titles, scorer=fuzz.ratio)[0]) / 100
+                artist_similarities = np.rint(process.cdist([source_track.clean_artist], target_artists, scorer=fuzz.ratio)[0]) / 100
+                artist_word_similarities = np.rint(process.cdist([source_track.clean_artist], target_artists, scorer=fuzz.token_set_ratio)[0]) / 100
+
+            source_artist_words = set(source_track.clean_artist.split())
+            for j, target_track in enumerate(compared_targets):
+                print(f"        vs: {target_track.primary_artist} - {target_track.title}")
+                print(f"            Core: '{target_track.clean_core_title}' | Artist: '{target_track.clean_artist}'")
+                print(f"            Title sim: {title_similarities[j]:.2f}, Artist sim: {artist_similarities[j]:.2f}")
+
+                shared_artist_words = source_artist_words & set(target_track.clean_artist.split())
+                if artist_similarities[j] < ARTIST_SIMILARITY_THRESHOLD and shared_artist_words:
+                    print(f"            Artist compared by words: {artist_word_similarities[j]:.2f} (word overlap: {shared_artist_words})")
+
+            if matched:
+                print(f"            ✓ MATCH FOUND")
+            else:
+                print(f"        ✗ NO MATCH - marked as missing")
+
+    def __deduplicate(self, keys: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], np.ndarray]:
+        """
+        Returns the unique keys (in order of first occurrence) and the position of each key among them.
+        """
+
+        positions: Dict[Tuple[str, str], int] = {}
+        inverse = np.fromiter(
+            (positions.setdefault(key, len(positions)) for key in keys),
+            dtype=np.intp,
+            count=len(keys)
+        )
+
+        return list(positions), inverse
+
+    def __get_match_matrix(self, source_playlist_tracks: List[Track], target_playlist_tracks: List[Track]) -> np.ndarray:
+        """
+        Returns a boolean matrix where [i, j] tells if the i-th source track and the j-th target track are the same track.
+
+        The matrix of the last call is reused if it was made for the same tracks, so calling find_missing_tracks(),
+        find_tracks_to_remove() and is_in_same_order() with the same tracks right after each other only compares the playlists once.
+        """
+
+        source_tracks = tuple(source_playlist_tracks)
+        target_tracks = tuple(target_playlist_tracks)
+
+        if self.__last_match:
+            last_source_tracks, last_target_tracks, match_matrix = self.__last_match
+            if self.__are_same_tracks(source_tracks, last_source_tracks) and self.__are_same_tracks(target_tracks, last_target_tracks):
+                return match_matrix
+
+        match_matrix = self.__compute_equivalence_matrix(
+            source_tracks=source_tracks,
+            target_tracks=target_tracks
+        )
+        self.__last_match = (source_tracks, target_tracks, match_matrix)
+
+        return match_matrix
+
+    def __are_same_tracks(self, a: Tuple[Track, ...], b: Tuple[Track, ...]) -> bool:
+        """
+        Tells if both tuples hold the very same track objects in the same order.
+        """
+
+        return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+
+    def __find_first_matches(self, match_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns whether each row of the matrix has a match and the column of its first match (0 if it has none).
+        """
+
+        if match_matrix.shape[1] == 0:
+            return np.zeros(match_matrix.shape[0], dtype=bool), np.zeros(match_matrix.shape[0], dtype=int)
+
+        return match_matrix.any(axis=1), match_matrix.argmax(axis=1)
+
+    def __resolve_unmatched(self, match_matrix: np.ndarray, row_tracks: List[Track], column_tracks: List[Track]) -> None:
+        """
+        Falls back to Track.matches() for rows of the matrix that have no match yet and records the first match found.
+        Candidates are tried from the most to the least similar title, so the search usually stops at the first one.
+
+        Pass the transposed matrix to resolve columns instead (the comparison is symmetric).
+        """
+
+        unmatched_rows = np.flatnonzero(~match_matrix.any(axis=1))
+        if unmatched_rows.size == 0 or not column_tracks:
+            return
+
+        # Candidates are found for a block of rows at a time, see SIMILARITY_BLOCK_ROWS
+        for start in range(0, unmatched_rows.size, SIMILARITY_BLOCK_ROWS):
+            block_rows = unmatched_rows[start:start + SIMILARITY_BLOCK_ROWS]
+            # Tracks sharing an identifier are tried first, then from the most to the least similar title
+            candidates = find_possible_matches([row_tracks[i] for i in block_rows], column_tracks, workers=-1)
+
+            for row, i in enumerate(block_rows):
+                row_track = row_tracks[i]
+                columns = np.flatnonzero(candidates[row])
+                # Stable sort, so equally similar candidates keep their playlist order
+                for j in columns[np.argsort(-candidates[row, columns], kind='stable')]:
+                    if row_track.matches(column_tracks[j]):
+                        match_matrix[i, j] = True
+                        break
@@ -0,0 +1,62 @@
+from typing import Dict, List
+
+import numpy as np
+
+from tunesynctool.models import Track
+from tunesynctool.models.track import MINIMUM_TITLE_SIMILARITY, MINIMUM_ARTIST_SIMILARITY, ARTIST_LENIENCY_TITLE_SIMILARITY
+from tunesynctool.utilities import calculate_similarity_matrix
+
+IDENTIFIER_MATCH_PRIORITY = 101
+"""Score find_possible_matches() gives tracks sharing an ISRC or MusicBrainz ID (above any title similarity score)."""
+
+def find_possible_matches(row_tracks: List[Track], column_tracks: List[Track], workers: int = 1) -> np.ndarray:
+    """
+    Returns a matrix of the track pairs that Track.matches() could possibly accept, where [i, j] is the title similarity
+    (between 100 and 0) of the i-th row and the j-th column track, IDENTIFIER_MATCH_PRIORITY if they share an identifier
+    and 0 if Track.matches() never accepts them.
+
+    Track.matches() always rejects tracks with dissimilar titles or artists unless they share an identifier,
+    so all pairs are checked against those minimums in a single batch instead of one by one.
+    The workers are passed on to calculate_similarity_matrix().
+    """
+
+    # Track.matches() uses the better of the full and core title similarities
+    title_similarities = np.maximum(*(
+        calculate_similarity_matrix(
+            [getattr(track, title_field) for track in row_tracks],
+            [getattr(track, title_field) for track in column_tracks],
+            threshold=MINIMUM_TITLE_SIMILARITY,
+            workers=workers
+        )
+        for title_field in ('clean_title', 'clean_core_title')
+    ))
+    similar_artists = calculate_similarity_matrix(
+        [track.clean_artist for track in row_tracks],
+        [track.clean_artist for track in column_tracks],
+        threshold=MINIMUM_ARTIST_SIMILARITY,
+        workers=workers
+    ) > 0
+
+    # Dissimilar artists are only tolerated if the titles are very similar and the artists share a name
+    # (rounded to whole percents like calculate_str_similarity() does)
+    possible_matches = similar_artists & (title_similarities > 0)
+    lenient_rows, lenient_columns = np.nonzero(
+        ~similar_artists & (np.rint(title_similarities) >= round(ARTIST_LENIENCY_TITLE_SIMILARITY * 100))
+    )
+    for i, j in zip(lenient_rows, lenient_columns):
+        possible_matches[i, j] = not set(row_tracks[i].clean_artist.split()).isdisjoint(column_tracks[j].clean_artist.split())
+
+    candidates = np.where(possible_matches, title_similarities, 0)
+
+    # Tracks sharing an identifier are always accepted
+    for identifier in ('isrc', 'musicbrainz_id'):
+        column_indexes: Dict[str, List[int]] = {}
+        for j, track in enumerate(column_tracks):
+            if getattr(track, identifier):
+                column_indexes.setdefault(getattr(track, identifier), []).append(j)
+
+        for i, track in enumerate(row_tracks):
+            if getattr(track, identifier) in column_indexes:
+                candidates[i, column_indexes[getattr(track, identifier)]] = IDENTIFIER_MATCH_PRIORITY
+
+    return candidates
@@ -1,18 +1,100 @@
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from tunesynctool.drivers import ServiceDriver
 from tunesynctool.exceptions import TrackNotFoundException
 from tunesynctool.models import Track
+from tunesynctool.models.track import MATCH_THRESHOLD
+from tunesynctool.features.possible_matches import find_possible_matches
 from tunesynctool.integrations import Musicbrainz
-from tunesynctool.utilities import clean_str, extract_core_title
+
+SEARCH_CACHE_SIZE = 1024
+"""Number of distinct target service searches a TrackMatcher remembers."""
+
+LENIENT_MATCH_THRESHOLD = 0.6
+"""Minimum similarity of the fallback matching, which accepts tracks that wouldn't match by default."""
+
+TRACK_INDEX_SIZE = SEARCH_CACHE_SIZE * 50
+"""Number of tracks each index of a TrackMatcher remembers, about as many as its cached searches hold (up to 50 results each)."""
+
+class _TrackIndex:
+    """
+    Remembers tracks seen on the target service by a key (e.g., their ISRC).
+    Once it holds more than max_tracks tracks, the tracks of the least recently used keys are forgotten.
+    """
+
+    def __init__(self, max_tracks: int = TRACK_INDEX_SIZE) -> None:
+        self.__tracks: OrderedDict[str, Dict[Tuple[str, str], Track]] = OrderedDict()
+        self.__size = 0
+        self.__max_tracks = max_tracks
+
+    def add(self, key: str, track: Track) -> None:
+        """
+        Remembers the track under the key (next to the tracks already remembered under it).
+        """
+
+        tracks = self.__tracks.get(key)
+        if tracks is None:
+            tracks = self.__tracks[key] = {}
+        else:
+            self.__tracks.move_to_end(key)
+
+        track_key = (track.service_id, track.service_name)
+        if track_key not in tracks:
+            tracks[track_key] = track
+            self.__size += 1
+
+        while self.__size > self.__max_tracks:
+            _, forgotten_tracks = self.__tracks.popitem(last=False)
+            self.__size -= len(forgotten_tracks)
+
+    def get(self, key: str) -> List[Track]:
+        """
+        Returns the tracks remembered under the key, in the order they were first seen.
+        """
+
+        tracks = self.__tracks.get(key)
+        if not tracks:
+            return []
+
+        self.__tracks.move_to_end(key)
+
+        return list(tracks.values())
+
+    def __len__(self) -> int:
+        return self.__size
 
 class TrackMatcher:
     """
     Attempts to find a matching track between the source and target services.
     """
 
-    def __init__(self, target_driver: ServiceDriver) -> None:
+    def __init__(self, target_driver: ServiceDriver, search_workers: int = 1) -> None:
+        """
+        :param target_driver: The driver for the target service.
+        :param search_workers: How many search queries of a single track can be sent to the target service at once.
+            By default they are sent one after the other, raise it only if the target service allows concurrent requests.
+        """
+
         self._target = target_driver
+        self._search_workers = search_workers
+
+        # The same queries come up across strategies and tracks (e.g., searching for the same artist),
+        # so their results are reused instead of asking the target service again
+        self._cached_search_tracks = lru_cache(maxsize=SEARCH_CACHE_SIZE)(target_driver.search_tracks)
+
+        # Tracks seen on the target service by their identifiers, so tracks that already came up
+        # in earlier searches can be matched without asking the target service again
+        # (limited like the search cache, so long syncs don't keep every track they've seen)
+        self._isrc_index = _TrackIndex()
+        self._musicbrainz_id_index = _TrackIndex()
+
+        # Tracks seen on the target service by their normalized full and core title, so tracks that came up
+        # in earlier searches (e.g., when searching for the same artist) can be found by title (limited the same way)
+        self._title_index = _TrackIndex()
 
     def find_match(self, track: Track) -> Optional[Track]:
         """
@@ -22,19 +104,21 @@ class TrackMatcher:
         There is no guarantee that the tracks will be matched correctly or that any will be matched at all.
         """
 
-        # Strategy 0: If the track is suspected to originate from the same service, try to fetch it directly
-        matched_track = self.__search_on_origin_service(track)
-        if track.matches(matched_track):
-            return matched_track
-        
-        # Strategy 1: If the track has an ISRC, try to search for it directly
+        # The strategies below already make sure that the track they return matches
+
+        # Strategy 0: If the track has an ISRC, try to search for it directly (a single request that is the most reliable)
         matched_track = self.__search_by_isrc_only(track)
-        if track.matches(matched_track):
+        if matched_track:
+            return matched_track
+
+        # Strategy 1: If the track is suspected to originate from the same service, try to fetch it directly
+        matched_track = self.__search_on_origin_service(track)
+        if matched_track:
             return matched_track
         
         # Strategy 2: Using plain old text search
         matched_track = self.__search_with_text(track)
-        if track.matches(matched_track):
+        if matched_track:
             return matched_track
 
         # Stategy 3: Using the ISRC + MusicBrainz ID
@@ -42,7 +126,7 @@ class TrackMatcher:
         if track.matches(matched_track):
             return matched_track
 
-        # Strategy 4: Fallback with very lenient matching (ignores parenthetical content and lower threshold)
+        # Strategy 4: Fallback with very lenient matching (wider searches and lower threshold)
         matched_track = self.__search_with_lenient_matching(track)
         if matched_track:
             return matched_track
@@ -75,9 +159,13 @@ class TrackMatcher:
         
         if not track.musicbrainz_id:
             return None
+
+        indexed_tracks = self._musicbrainz_id_index.get(track.musicbrainz_id)
+        if indexed_tracks:
+            return indexed_tracks[0]
         
         if self._target.supports_musicbrainz_id_querying:
-            results = self._target.search_tracks(
+            results = self.__search_tracks(
                 query=track.musicbrainz_id,
                 limit=1
             )
@@ -92,10 +180,15 @@ class TrackMatcher:
         Searches for tracks using plain text with multiple query variations.
         """
 
+        # No search result could be more similar than a perfect match found in earlier searches
+        for seen_track in self.__find_seen_tracks_by_title(track):
+            if track.similarity(seen_track) == 1:
+                return seen_track
+
         # Get base strings
-        title_clean = clean_str(track.title)
-        artist_clean = clean_str(track.primary_artist)
-        title_core = clean_str(extract_core_title(track.title))
+        title_clean = track.clean_title
+        artist_clean = track.clean_artist
+        title_core = track.clean_core_title
         
         # Create multiple query variations to maximize chances of finding a match
         queries = []
@@ -120,10 +213,7 @@ class TrackMatcher:
         if artist_clean:
             queries.append(artist_clean)
 
-        results: List[Track] = []
-        seen_ids = set()
-        
-        # Search with each query, collecting unique results
+        searches: List[Tuple[str, int]] = []
         for query in queries:
             if not query:
                 continue
@@ -137,33 +227,36 @@ class TrackMatcher:
                 limit = 50  # Title-only queries need more results
             else:
                 limit = 40  # Everything else
-                
-            search_results = self._target.search_tracks(
-                query=query,
-                limit=limit
-            )
-            
-            # Add only unique tracks
-            for result in search_results:
-                result_key = (result.service_id, result.service_name)
-                if result_key not in seen_ids:
-                    seen_ids.add(result_key)
-                    results.append(result)
-
-        # Try to find a match in all collected results
-        for result in results:
-            if track.matches(result):
-                return result
-            
-        return None
+
+            searches.append((query, limit))
+
+        results: List[Track] = []
+        seen_ids = set()
+
+        with closing(self.__search_all(searches)) as all_search_results:
+            for search_results in all_search_results:
+                # Add only unique tracks
+                for result in search_results:
+                    result_key = (result.service_id, result.service_name)
+                    if result_key not in seen_ids:
+                        seen_ids.add(result_key)
+                        results.append(result)
+
+                        # An identical ISRC or MusicBrainz ID is certainly a match,
+                        # so there is no need to wait for the remaining queries or run any fuzzy comparison
+                        if track.shares_identifier(result):
+                            return result
+
+        return self.__find_best_match(track, results, threshold=MATCH_THRESHOLD)
     
     def __search_on_origin_service(self, track: Track) -> Optional[Track]:
         """
         If it is suspected that the track originates from the same service, it tries to fetch it directly.
         """
 
-        if (track.service_name and self._target.service_name) and (track.service_name == self._target.service_name):
+        if (track.service_name and self._target.service_name) and (track.service_name.lower() == self._target.service_name.lower()):
             maybe_match = self._target.get_track(track.service_id)
+            self.__index_tracks([maybe_match] if maybe_match else [])
             
             if maybe_match and track.matches(maybe_match):
                 return maybe_match
@@ -177,13 +270,22 @@ class TrackMatcher:
         In theory, this should be the most reliable way to match tracks.
         """
 
-        if not track.isrc or not self._target.supports_direct_isrc_querying:
+        if not track.isrc:
+            return None
+
+        # A track with the same ISRC may have come up in an earlier search already
+        indexed_tracks = self._isrc_index.get(track.isrc)
+        if indexed_tracks and track.matches(indexed_tracks[0]):
+            return indexed_tracks[0]
+
+        if not self._target.supports_direct_isrc_querying:
             return None
         
         try:
             likely_match = self._target.get_track_by_isrc(
                 isrc=track.isrc
             )
+            self.__index_tracks([likely_match] if likely_match else [])
 
             if likely_match and track.matches(likely_match):
                 return likely_match
@@ -195,41 +297,35 @@ class TrackMatcher:
     def __search_with_lenient_matching(self, track: Track) -> Optional[Track]:
         """
         Fallback search with very lenient matching criteria.
-        Ignores parenthetical content and uses lower similarity thresholds.
+        Casts a wider net than the text search and uses a lower similarity threshold.
         """
 
         # Extract core title (without parenthetical content)
-        core_title = clean_str(extract_core_title(track.title))
-        artist = clean_str(track.primary_artist)
-        
+        core_title = track.clean_core_title
+        artist = track.clean_artist
+
         if not core_title or not artist:
             return None
-        
-        # Search with just artist + core title
-        queries = [
-            f'{artist} {core_title}',
-            core_title,
-            artist
+
+        # Search with just artist + core title, core title and artist, with larger limits than the text search
+        # (searches the text search already sent with the same limit are reused from the cache)
+        searches = [
+            (f'{artist} {core_title}', 50),
+            (core_title, 50),
+            (artist, 50)
         ]
-        
+
         results: List[Track] = []
         seen_ids = set()
-        
-        for query in queries:
-            if not query:
-                continue
-                
-            search_results = self._target.search_tracks(
-                query=query,
-                limit=50  # Cast a wide net
-            )
-            
-            for result in search_results:
-                result_key = (result.service_id, result.service_name)
-                if result_key not in seen_ids:
-                    seen_ids.add(result_key)
-                    results.append(result)
-        
+
+        with closing(self.__search_all(searches)) as all_search_results:
+            for search_results in all_search_results:
+                for result in search_results:
+                    result_key = (result.service_id, result.service_name)
+                    if result_key not in seen_ids:
+                        seen_ids.add(result_key)
+                        results.append(result)
+
         # Sort results to prefer canonical versions over remixes/edits
         # Canonical versions typically have shorter titles without version suffixes
         def is_canonical(track_title: str) -> tuple:
@@ -242,11 +338,93 @@ class TrackMatcher:
             has_version = any(keyword in lower_title for keyword in version_keywords)
             return (has_version, len(track_title))
         
-        results.sort(key=lambda t: is_canonical(t.title))
+        # Equally similar results are decided by this order
+        results = sorted(results, key=lambda t: is_canonical(t.title))
         
-        # Try matching with much lower threshold (0.60 instead of 0.75)
-        for result in results:
-            if track.matches(result, threshold=0.60):
-                return result
-        
-        return None
\ No newline at end of file
+        return self.__find_best_match(track, results, threshold=LENIENT_MATCH_THRESHOLD)
+
+    def __find_best_match(self, track: Track, results: List[Track], threshold: float) -> Optional[Track]:
+        """
+        Returns the result most similar to the track, if it's at least as similar as the threshold.
+        Of equally similar results, the first one wins.
+        """
+
+        candidates = self.__rule_out_impossible_matches(track, results)
+        if not candidates:
+            return None
+
+        similarities = [track.similarity(candidate) for candidate in candidates]
+        best = max(range(len(candidates)), key=similarities.__getitem__)
+
+        return candidates[best] if similarities[best] >= threshold else None
+
+    def __search_all(self, searches: List[Tuple[str, int]]) -> Iterator[List[Track]]:
+        """
+        Yields the results of each (query, limit) search in order.
+
+        The searches are independent requests, so with more than one search worker they are sent at once.
+        Searches whose results are no longer needed are cancelled once the iterator is closed.
+        """
+
+        # Without concurrency (or anything to run concurrently), each query is sent once the previous one is done
+        if self._search_workers <= 1 or len(searches) <= 1:
+            for query, limit in searches:
+                yield self.__search_tracks(query=query, limit=limit)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self._search_workers, len(searches)))
+        try:
+            yield from executor.map(lambda search: self.__search_tracks(query=search[0], limit=search[1]), searches)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __search_tracks(self, query: str, limit: int) -> List[Track]:
+        """
+        Searches for tracks on the target service (reusing earlier results of the same search) and indexes the results.
+        """
+
+        results = self._cached_search_tracks(query=query, limit=limit)
+        self.__index_tracks(results)
+
+        return results
+
+    def __index_tracks(self, tracks: List[Track]) -> None:
+        """
+        Remembers tracks of the target service by their ISRC, MusicBrainz ID (lookups return the first track seen with an identifier)
+        and their normalized full and core title.
+        """
+
+        for track in tracks:
+            if track.isrc:
+                self._isrc_index.add(track.isrc, track)
+            if track.musicbrainz_id:
+                self._musicbrainz_id_index.add(track.musicbrainz_id, track)
+
+            for title in {track.clean_title, track.clean_core_title}:
+                if title:
+                    self._title_index.add(title, track)
+
+    def __find_seen_tracks_by_title(self, track: Track) -> List[Track]:
+        """
+        Returns the tracks seen in earlier searches whose normalized full or core title is the same as the track's.
+        These are the tracks that are the most likely to be perfectly similar to it, found without comparing every one.
+        """
+
+        seen_tracks: Dict[Tuple[str, str], Track] = {}
+        for title in (track.clean_title, track.clean_core_title):
+            for seen_track in self._title_index.get(title):
+                seen_tracks.setdefault((seen_track.service_id, seen_track.service_name), seen_track)
+
+        return list(seen_tracks.values())
+
+    def __rule_out_impossible_matches(self, track: Track, results: List[Track]) -> List[Track]:
+        """
+        Returns the results that Track.matches() could possibly accept, in their original order.
+        """
+
+        if not results:
+            return results
+
+        possible_matches = find_possible_matches([track], results)[0]
+
+        return [result for result, score in zip(results, possible_matches) if score > 0]
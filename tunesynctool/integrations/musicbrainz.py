@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 from tunesynctool.models import Track
@@ -7,10 +8,14 @@ import musicbrainzngs
 
 musicbrainzngs.set_useragent("tunesynctool", "1.0", "https://github.com/WilliamNT/tunesynctool")
 
+LOOKUP_CACHE_SIZE = 4096
+"""Number of Musicbrainz ID lookups remembered, since the API is slow and rate limited."""
+
 class Musicbrainz:
     """Responsible for interacting with the Musicbrainz API."""
 
     @staticmethod
+    @lru_cache(maxsize=LOOKUP_CACHE_SIZE)
     def id_from_isrc(isrc: str) -> Optional[str]:
         """Fetches the Musicbrainz ID for a track given its ISRC."""
             
@@ -27,14 +32,29 @@ class Musicbrainz:
         if track.musicbrainz_id:
             return track.musicbrainz_id
         
-        response: dict = musicbrainzngs.search_recordings(
-            query=clean_str(track.title),
+        return Musicbrainz.__search_recording_id(
+            title=track.title,
             artist=track.primary_artist,
-            date=track.release_year,
-            alias=track.title,
+            release_year=track.release_year,
             isrc=track.isrc
         )
 
+    @staticmethod
+    @lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+    def __search_recording_id(title: Optional[str], artist: Optional[str], release_year: Optional[int], isrc: Optional[str]) -> Optional[str]:
+        """
+        Searches for the Musicbrainz ID of a recording.
+        Results are cached by the metadata used for the search, so looking up the same track again doesn't hit the API.
+        """
+
+        response: dict = musicbrainzngs.search_recordings(
+            query=clean_str(title),
+            artist=artist,
+            date=release_year,
+            alias=title,
+            isrc=isrc
+        )
+
         return Musicbrainz.__get_id(response)
     
     @staticmethod
@@ -1,9 +1,39 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Self
+import sys
+from typing import Dict, List, Optional, Self, Tuple
 
 from tunesynctool.utilities import clean_str, calculate_str_similarity, calculate_int_closeness, extract_core_title
 
-@dataclass
+MINIMUM_TITLE_SIMILARITY = 0.65
+"""Tracks whose titles are less similar than this never match, unless they share an ISRC or MusicBrainz ID."""
+
+MINIMUM_ARTIST_SIMILARITY = 0.5
+"""Tracks whose artists are less similar than this only match if their titles are very similar and their artists share a name."""
+
+ARTIST_LENIENCY_TITLE_SIMILARITY = 0.85
+"""Minimum title similarity for tracks with dissimilar artists to still match, see MINIMUM_ARTIST_SIMILARITY."""
+
+MATCH_THRESHOLD = 0.75
+"""Minimum similarity of two tracks for them to match by default, see Track.matches()."""
+
+MATCH_WEIGHTS: Dict[Tuple[bool, bool], Dict[str, float]] = {
+    (has_album_names, has_track_numbers): {
+        'title': 4.0,
+        'artist': 2.5,  # Reduced from 3.0 to be more lenient
+        'album': 1.25 if has_album_names else 0.75,
+        'duration': 0.75,
+        'track': 0.5 if has_track_numbers else 0,
+        'year': 0.5 if has_track_numbers else 0,
+    }
+    for has_album_names in (False, True)
+    for has_track_numbers in (False, True)
+}
+"""Weights of the similarities compared by Track.matches(), by whether both tracks have an album name and a track number."""
+
+MATCH_WEIGHT_TOTALS: Dict[Tuple[bool, bool], float] = {key: sum(weights.values()) for key, weights in MATCH_WEIGHTS.items()}
+"""Sum of the weights in MATCH_WEIGHTS."""
+
+@dataclass(slots=True, eq=False)
 class Track:
     """Represents a single track."""
 
@@ -40,8 +70,29 @@ class Track:
     service_name: str = field(default='unknown')
     """Source service for the track."""
 
-    service_data: Optional[dict] = field(default_factory=dict)
-    """Raw JSON response data from the source service."""
+    service_data: Optional[dict] = field(default=None)
+    """Raw JSON response data from the source service (None for tracks that weren't fetched from a service)."""
+
+    clean_title: str = field(init=False, repr=False, compare=False)
+    """Normalized title of the track."""
+
+    clean_core_title: str = field(init=False, repr=False, compare=False)
+    """Normalized title of the track without featured artists and version info."""
+
+    clean_artist: str = field(init=False, repr=False, compare=False)
+    """Normalized primary artist of the track."""
+
+    clean_album_name: str = field(init=False, repr=False, compare=False)
+    """Normalized name of the album containing the track."""
+
+    def __post_init__(self) -> None:
+        # Tracks are not modified after they are created and get compared to many other tracks,
+        # so their normalized strings are computed once. They are interned since the same artists
+        # and albums (and often titles) come up in many tracks.
+        self.clean_title = sys.intern(clean_str(self.title))
+        self.clean_core_title = sys.intern(clean_str(extract_core_title(self.title)))
+        self.clean_artist = sys.intern(clean_str(self.primary_artist))
+        self.clean_album_name = sys.intern(clean_str(self.album_name))
 
     def __str__(self) -> str:
         return f"{self.track_number}. - {self.primary_artist} - {self.title}"
@@ -58,7 +109,21 @@ class Track:
     def __hash__(self):
         return hash((self.service_id, self.service_name))
 
-    def matches(self, other: Optional[Self], threshold: float = 0.75) -> bool:
+    def shares_identifier(self, other: Optional[Self]) -> bool:
+        """
+        Tells if both tracks have the same ISRC or MusicBrainz ID, in which case they are certainly the same recording.
+        This is the cheap part of matches(), so it can be used to skip the fuzzy comparison for exact hits.
+        """
+
+        if not other:
+            return False
+
+        if (self.isrc and other.isrc) and self.isrc == other.isrc:
+            return True
+        
+        return bool(self.musicbrainz_id and other.musicbrainz_id) and self.musicbrainz_id == other.musicbrainz_id
+
+    def matches(self, other: Optional[Self], threshold: float = MATCH_THRESHOLD) -> bool:
         """
         Compares two tracks for equality, regardless of their source service.
         For primitive matching, use the __eq__ method (== operator).
@@ -69,65 +134,104 @@ class Track:
         if not other:
             return False
         
-        if (self.isrc and other.isrc) and self.isrc == other.isrc:
+        if self.shares_identifier(other):
             return True
-        elif (self.musicbrainz_id and other.musicbrainz_id) and self.musicbrainz_id == other.musicbrainz_id:
+
+        scores = self.__compare(other)
+        if not scores:
+            return False
+
+        title_and_artist_score, duration_score, track_score, year_score, album_weight, total_weight = scores
+
+        # The album similarity is only computed if the outcome depends on it,
+        # i.e. if the lowest and the highest possible album similarity lead to different results
+        if round((title_and_artist_score + duration_score + track_score + year_score) / total_weight, 2) >= threshold:
             return True
-        
+
+        if round((title_and_artist_score + album_weight + duration_score + track_score + year_score) / total_weight, 2) < threshold:
+            return False
+
+        album_score = calculate_str_similarity(self.clean_album_name, other.clean_album_name) * album_weight
+        similarity_ratio = round((title_and_artist_score + album_score + duration_score + track_score + year_score) / total_weight, 2)
+
+        return similarity_ratio >= threshold
+
+    def similarity(self, other: Optional[Self]) -> float:
+        """
+        Returns how similar two tracks are (between 1 and 0), which is what matches() compares against its threshold.
+
+        Tracks sharing an ISRC or MusicBrainz ID are 1, tracks with dissimilar titles or artists are 0.
+        """
+
+        if not other:
+            return float(0)
+
+        if self.shares_identifier(other):
+            return float(1)
+
+        scores = self.__compare(other)
+        if not scores:
+            return float(0)
+
+        title_and_artist_score, duration_score, track_score, year_score, album_weight, total_weight = scores
+        album_score = calculate_str_similarity(self.clean_album_name, other.clean_album_name) * album_weight
+
+        return round((title_and_artist_score + album_score + duration_score + track_score + year_score) / total_weight, 2)
+
+    def __compare(self, other: Self) -> Optional[Tuple[float, float, float, float, float, float]]:
+        """
+        Returns the weighted scores of the title and artist (combined), duration, track number and release year,
+        the weight of the album and the sum of all weights, or None if the tracks definitely don't match.
+
+        The album score is left to the caller since it's the most expensive one and isn't always needed.
+        When adding up the scores, the album score has to come right after the title and artist to get the exact same results.
+        """
+
         # Compare both full titles and core titles (without featured artists/version info)
-        title_similarity = calculate_str_similarity(clean_str(self.title), clean_str(other.title))
-        core_title_similarity = calculate_str_similarity(
-            clean_str(extract_core_title(self.title)), 
-            clean_str(extract_core_title(other.title))
-        )
-        # Use the better of the two similarities
-        best_title_similarity = max(title_similarity, core_title_similarity)
-        
-        artist_similarity = calculate_str_similarity(clean_str(self.primary_artist), clean_str(other.primary_artist))
+        # and use the better of the two similarities (nothing beats identical full titles)
+        best_title_similarity = calculate_str_similarity(self.clean_title, other.clean_title)
+        if best_title_similarity < 1:
+            best_title_similarity = max(
+                best_title_similarity,
+                calculate_str_similarity(self.clean_core_title, other.clean_core_title)
+            )
 
         # If title similarity is very low, it's definitely not a match
-        if best_title_similarity < 0.65:
-            return False
+        if best_title_similarity < MINIMUM_TITLE_SIMILARITY:
+            return None
         
+        artist_similarity = calculate_str_similarity(self.clean_artist, other.clean_artist)
+
         # For artist similarity, be more lenient since:
         # 1. Featured artists may be included differently (in title vs as separate artist)
         # 2. Collaborations may list artists in different order
         # 3. Artist names may have different capitalization or separators
         # Allow matches with lower artist similarity if title similarity is high
-        if artist_similarity < 0.5:
+        if artist_similarity < MINIMUM_ARTIST_SIMILARITY:
             # If title is very similar, check if one artist string contains parts of the other
-            if best_title_similarity >= 0.85:
+            if best_title_similarity >= ARTIST_LENIENCY_TITLE_SIMILARITY:
                 # Check if any word from one artist appears in the other
-                self_artist_words = set(clean_str(self.primary_artist).split())
-                other_artist_words = set(clean_str(other.primary_artist).split())
+                self_artist_words = set(self.clean_artist.split())
+                other_artist_words = set(other.clean_artist.split())
                 
                 # If there's any overlap in artist names, consider it valid
                 if self_artist_words & other_artist_words:
                     # Boost artist similarity more for word overlap to ensure match passes threshold
                     artist_similarity = 0.7
                 else:
-                    return False
+                    return None
             else:
-                return False
+                return None
         
-        weights = {
-            'title': 4.0,
-            'artist': 2.5,  # Reduced from 3.0 to be more lenient
-            'album': 1.25 if self.album_name and other.album_name else 0.75,
-            'duration': 0.75,
-            'track': 0.5 if self.track_number and other.track_number else 0,
-            'year': 0.5 if self.track_number and other.track_number else 0,
-        }
-
-        variables = [
-            best_title_similarity * weights['title'],
-            artist_similarity * weights['artist'],
-            calculate_str_similarity(clean_str(self.album_name), clean_str(other.album_name)) * weights['album'],
-            calculate_int_closeness(self.duration_seconds, other.duration_seconds) * weights['duration'],
-            calculate_int_closeness(self.track_number, other.track_number) * weights['track'],
-            calculate_int_closeness(self.release_year, other.release_year) * weights['year'],
-        ]
+        has_album_names = bool(self.album_name and other.album_name)
+        has_track_numbers = bool(self.track_number and other.track_number)
+        weights = MATCH_WEIGHTS[has_album_names, has_track_numbers]
 
-        similarity_ratio = round(sum(variables) / sum(weights.values()), 2)
-
-        return similarity_ratio >= threshold
\ No newline at end of file
+        return (
+            best_title_similarity * weights['title'] + artist_similarity * weights['artist'],
+            calculate_int_closeness(self.duration_seconds, other.duration_seconds) * weights['duration'],
+            calculate_int_closeness(self.track_number, other.track_number) * weights['track'] if has_track_numbers else 0.0,
+            calculate_int_closeness(self.release_year, other.release_year) * weights['year'] if has_track_numbers else 0.0,
+            weights['album'],
+            MATCH_WEIGHT_TOTALS[has_album_names, has_track_numbers],
+        )
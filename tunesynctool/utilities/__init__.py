@@ -1,2 +1,2 @@
 from .normalization import clean_str, remove_parenthetical, extract_core_title
-from .comparison import calculate_int_closeness, calculate_str_similarity
\ No newline at end of file
+from .comparison import calculate_int_closeness, calculate_str_similarity, calculate_similarity_matrix
\ No newline at end of file
@@ -1,4 +1,7 @@
-from thefuzz import fuzz
+from typing import Callable, List
+
+from rapidfuzz import fuzz, process
+import numpy as np
 
 """
 There wasn't any advanced mathematical thinking behind the following functions.
@@ -11,7 +14,35 @@ def calculate_str_similarity(a: str, b: str) -> float:
     Returns a float between 1 and 0.
     """
 
-    return fuzz.ratio(a, b) / 100
+    # Identical strings are common when comparing already synced playlists and are far cheaper to detect
+    if a is not None and a == b:
+        return float(1)
+
+    # Rounded to whole percents like thefuzz did, so the thresholds used throughout behave the same
+    return round(fuzz.ratio(a, b)) / 100
+
+def calculate_similarity_matrix(a: List[str], b: List[str], threshold: float, scorer: Callable = fuzz.ratio, workers: int = 1) -> np.ndarray:
+    """
+    Calculates the similarity scores between every string of a and every string of b in a single batch.
+    Returns a matrix of scores between 100 and 0 where [i, j] is 0 unless a[i] and b[j] are at least
+    as similar as the threshold (between 1 and 0).
+
+    Scores are checked against the threshold after rounding them to whole percents like calculate_str_similarity() does.
+    Use workers=-1 to spread large batches over all CPU cores.
+    """
+
+    threshold_percent = round(threshold * 100)
+    score_cutoff = threshold_percent - 0.5
+
+    # Scores below the cutoff are reported as 0, which also lets rapidfuzz skip
+    # pairs whose length difference alone rules out the threshold
+    scores = process.cdist(a, b, scorer=scorer, score_cutoff=score_cutoff, workers=workers)
+
+    # round() rounds halves to even, so an exact half only counts when it rounds up
+    if round(score_cutoff) < threshold_percent:
+        scores[scores == score_cutoff] = 0
+
+    return scores
 
 def calculate_int_closeness(a: int, b: int) -> float:
     """
@@ -1,6 +1,12 @@
+from functools import lru_cache
 from typing import Optional, Dict
 import re
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 # Constants for substitution patterns
 ARTIST_FEATURES: Dict[str, str] = {
     'featuring': ' ', 'with': '',
@@ -30,6 +36,46 @@ PUNCTUATION: Dict[str, str] = {
     '·': ' ',  # Middle dot
 }
 
+# Most titles and artists contain none of the artist feature terms, so a single scan for any of them
+# lets clean_str() skip the substitutions (which have to stay sequential, as they can depend on each other).
+_ARTIST_FEATURES_RE = re.compile('|'.join(re.escape(term) for term in sorted(ARTIST_FEATURES, key=len, reverse=True)))
+
+# Conjunctions, brackets and punctuation are all single characters, so they can be applied in a single str.translate() pass.
+# Removals are mapped to None, which keeps CPython on its fast path for ASCII strings.
+# Lowercasing can't be part of it, the artist feature terms have to be matched on the lowercased text before punctuation is removed.
+_TRANSLATION_TABLE = str.maketrans({old: new or None for old, new in {**CONJUNCTIONS, **BRACKETS, **PUNCTUATION}.items()})
+
+# Most titles and artists are ASCII, which bytes.translate() handles with a plain 256 byte lookup table.
+# That's several times faster than str.translate(), even with the conjunctions replaced separately.
+_ASCII_SUBSTITUTIONS = {old: new for old, new in {**BRACKETS, **PUNCTUATION}.items() if old.isascii()}
+_ASCII_TRANSLATION_TABLE = bytes.maketrans(
+    ''.join(old for old, new in _ASCII_SUBSTITUTIONS.items() if new).encode('ascii'),
+    ''.join(new for old, new in _ASCII_SUBSTITUTIONS.items() if new).encode('ascii')
+)
+_ASCII_DELETIONS = ''.join(old for old, new in _ASCII_SUBSTITUTIONS.items() if not new).encode('ascii')
+
+# Number of distinct strings clean_str() and extract_core_title() remember.
+# Large enough for the titles, artists and album names of a sizeable library.
+_CACHE_SIZE = 16384
+
+# Parenthetical content, see remove_parenthetical()
+_PARENTHESES_RE = re.compile(r'\([^)]*\)')
+_BRACKETS_RE = re.compile(r'\[[^\]]*\]')
+
+# Matches everything after "- " up to a version keyword (simple greedy match)
+_CORE_TITLE_PATTERN = (
+    r'\s*-\s*.+?'  # Dash, then anything (non-greedy)
+    r'\b(?:Edit|Remix|Mix|Version|Remaster|Live|Acoustic|Instrumental)\b'  # Followed by version keyword
+)
+_CORE_TITLE_RE = re.compile(_CORE_TITLE_PATTERN, re.IGNORECASE)
+
+# The lazy match above backtracks on every dash, which gets slow on unusually long titles.
+# If google-re2 is installed, its linear time engine is used for those instead.
+# It has more overhead per call than re, so short titles still go through re.
+# RE2 only treats ASCII characters as word characters in \b (and whitespace in \s), so non-ASCII titles always go through re.
+_CORE_TITLE_RE2 = re2.compile(f'(?i){_CORE_TITLE_PATTERN}') if re2 else None
+_CORE_TITLE_RE2_MIN_LENGTH = 256
+
 def __apply_substitutions(text: str, substitutions: Dict[str, str]) -> str:
     """
     Apply a dictionary of substitutions to the given text.
@@ -44,19 +90,24 @@ def __normalize_whitespace(text: str) -> str:
     """
     return ' '.join(text.split())
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def clean_str(s: Optional[str]) -> str:
     """
     Cleans a string by removing special characters and common industry terms.
+    Results are cached since the same titles and artists are cleaned over and over during matching.
     """
     if not s:
         return ''
     
     text = s.lower().strip()
     
-    text = __apply_substitutions(text, ARTIST_FEATURES)
-    text = __apply_substitutions(text, CONJUNCTIONS)
-    text = __apply_substitutions(text, BRACKETS)
-    text = __apply_substitutions(text, PUNCTUATION)
+    if _ARTIST_FEATURES_RE.search(text):
+        text = __apply_substitutions(text, ARTIST_FEATURES)
+    if text.isascii():
+        text = __apply_substitutions(text, CONJUNCTIONS)
+        text = text.encode('ascii').translate(_ASCII_TRANSLATION_TABLE, _ASCII_DELETIONS).decode('ascii')
+    else:
+        text = text.translate(_TRANSLATION_TABLE)
     
     return __normalize_whitespace(text)
 
@@ -69,14 +120,16 @@ def remove_parenthetical(s: Optional[str]) -> str:
         return ''
     
     # Remove content in parentheses and brackets
-    text = re.sub(r'\([^)]*\)', '', s)
-    text = re.sub(r'\[[^\]]*\]', '', text)
+    text = _PARENTHESES_RE.sub('', s)
+    text = _BRACKETS_RE.sub('', text)
     
     return text.strip()
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def extract_core_title(s: Optional[str]) -> str:
     """
     Extracts the core title by removing parenthetical content and trailing dashes/version info.
+    Results are cached, see clean_str().
     """
     if not s:
         return ''
@@ -85,13 +138,7 @@ def extract_core_title(s: Optional[str]) -> str:
     text = remove_parenthetical(s)
     
     # Remove everything after a dash followed by version/remix indicators
-    # This uses a simple greedy match: everything after "- " up to a version keyword
-    text = re.split(
-        r'\s*-\s*.+?'  # Dash, then anything (non-greedy)
-        r'\b(?:Edit|Remix|Mix|Version|Remaster|Live|Acoustic|Instrumental)\b',  # Followed by version keyword
-        text,
-        maxsplit=1,
-        flags=re.IGNORECASE
-    )[0]
+    pattern = _CORE_TITLE_RE2 if _CORE_TITLE_RE2 and len(text) >= _CORE_TITLE_RE2_MIN_LENGTH and text.isascii() else _CORE_TITLE_RE
+    text = pattern.split(text, maxsplit=1)[0]
     
     return text.strip()
\ No newline at end of file